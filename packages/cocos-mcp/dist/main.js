@@ -3,9 +3,13 @@ var __importDefault = (this && this.__importDefault) || function (mod) {
     return (mod && mod.__esModule) ? mod : { "default": mod };
 };
 Object.defineProperty(exports, "__esModule", { value: true });
+const fs_1 = __importDefault(require("fs"));
 const net_1 = __importDefault(require("net"));
+const os_1 = __importDefault(require("os"));
+const path_1 = __importDefault(require("path"));
 const DEFAULT_PORT = 8787;
 let server = null;
+let unixServer = null;
 const activeSockets = new Set();
 const logBuffer = [];
 const MAX_LOG_ENTRIES = 500;
@@ -86,17 +90,33 @@ function getPort() {
 function toLine(obj) {
     return `${JSON.stringify(obj)}\n`;
 }
+// Serialize one response; a result JSON can't represent (BigInt, cycles)
+// becomes an error for that request instead of failing the whole line.
+function encodeResponse(resp) {
+    try {
+        return JSON.stringify(resp);
+    }
+    catch (err) {
+        return JSON.stringify({
+            id: resp.id,
+            error: { message: `Result is not JSON-serializable: ${(err === null || err === void 0 ? void 0 : err.message) || err}` },
+        });
+    }
+}
 async function handleRequest(req) {
-    log("info", `<-- ${req.method} (id=${req.id})`);
+    // A malformed batch item (null, a bare number) still gets a response.
+    const id = req && typeof req.id === "number" ? req.id : -1;
+    const method = req && req.method;
+    log("info", `<-- ${method} (id=${id})`);
     try {
-        const result = await dispatch(req.method, req.params);
-        log("info", `--> ${req.method} OK (id=${req.id})`);
-        return { id: req.id, result };
+        const result = await dispatch(method, req.params);
+        log("info", `--> ${method} OK (id=${id})`);
+        return { id, result };
     }
     catch (err) {
-        log("warn", `--> ${req.method} ERROR: ${err === null || err === void 0 ? void 0 : err.message} (id=${req.id})`);
+        log("warn", `--> ${method} ERROR: ${err === null || err === void 0 ? void 0 : err.message} (id=${id})`);
         return {
-            id: req.id,
+            id,
             error: { message: (err === null || err === void 0 ? void 0 : err.message) || String(err) },
         };
     }
@@ -329,58 +349,168 @@ async function editorDispatch(method, params) {
                 throw new Error("editor.createPrefab requires { nodeUuid, path }");
             }
             return message.request("scene", "create-prefab", params.nodeUuid, params.path);
+        case "createPrefabAndInfo": {
+            // createPrefab followed by scene.getPrefabInfo on the same node,
+            // saving the client a second round trip.
+            if (!(params === null || params === void 0 ? void 0 : params.nodeUuid) || !(params === null || params === void 0 ? void 0 : params.path)) {
+                throw new Error("editor.createPrefabAndInfo requires { nodeUuid, path }");
+            }
+            const created = await message.request("scene", "create-prefab", params.nodeUuid, params.path);
+            // The prefab exists at this point, so a failed lookup is reported
+            // alongside it rather than failing the whole call.
+            let info;
+            try {
+                info = await sceneDispatch("getPrefabInfo", { uuid: params.nodeUuid });
+            }
+            catch (err) {
+                info = { error: (err === null || err === void 0 ? void 0 : err.message) || String(err) };
+            }
+            return { created, info };
+        }
         case "getLogs":
             return getConsoleLogs(params);
         default:
             throw new Error(`Unknown editor method: ${method}`);
     }
 }
+async function handleLine(socket, line) {
+    // A line holds one request, or an array of them (a batch) that runs in
+    // order and is answered with one array of responses.
+    let req = null;
+    try {
+        req = JSON.parse(line);
+    }
+    catch (err) {
+        const errResp = {
+            id: -1,
+            error: { message: `Invalid JSON: ${(err === null || err === void 0 ? void 0 : err.message) || err}` },
+        };
+        socket.write(toLine(errResp));
+        return;
+    }
+    let out;
+    if (Array.isArray(req)) {
+        const resp = [];
+        for (const item of req) {
+            resp.push(encodeResponse(await handleRequest(item)));
+        }
+        out = `[${resp.join(",")}]\n`;
+    }
+    else {
+        out = `${encodeResponse(await handleRequest(req))}\n`;
+    }
+    if (!socket.destroyed) {
+        socket.write(out);
+    }
+}
+// Last resort when handleLine itself throws: answer every id on the line
+// so its callers don't wait out their timeout.
+function failLine(socket, line, err) {
+    const message = `Internal error: ${(err === null || err === void 0 ? void 0 : err.message) || err}`;
+    log("error", message);
+    if (socket.destroyed) {
+        return;
+    }
+    let req = null;
+    try {
+        req = JSON.parse(line);
+    }
+    catch {
+        // answered with id -1 below
+    }
+    const errorFor = (r) => ({
+        id: r && typeof r.id === "number" ? r.id : -1,
+        error: { message },
+    });
+    socket.write(toLine(Array.isArray(req) ? req.map(errorFor) : errorFor(req)));
+}
+// Must match _unix_socket_path() in the Python server. The per-user
+// runtime directory keeps other local users from claiming the path first.
+function unixSocketPath(port) {
+    if (process.platform === "win32") {
+        return null;
+    }
+    const base = process.env.XDG_RUNTIME_DIR || os_1.default.tmpdir();
+    return path_1.default.join(base, `cocos-mcp-${port}.sock`);
+}
+function handleConnection(socket) {
+    activeSockets.add(socket);
+    // Responses are small and the client waits on each one, so don't let
+    // Nagle hold them back; keepalive drops clients that vanished silently.
+    socket.setNoDelay(true);
+    socket.setKeepAlive(true, 30000);
+    log("info", `Client connected (${activeSockets.size} active)`);
+    socket.on("close", () => {
+        activeSockets.delete(socket);
+        log("info", `Client disconnected (${activeSockets.size} active)`);
+    });
+    socket.on("error", (err) => {
+        activeSockets.delete(socket);
+        log("warn", `Socket error: ${err.message}`);
+    });
+    // Bytes of a partial line. Only each new chunk is scanned for "\n", and
+    // lines are decoded whole so multi-byte characters split across
+    // chunks survive.
+    let partial = [];
+    // Requests on one connection run strictly in arrival order, so a
+    // pipelined batch behaves exactly like the same calls sent one by one.
+    let pending = Promise.resolve();
+    socket.on("data", (data) => {
+        let start = 0;
+        let idx = data.indexOf(0x0a);
+        while (idx >= 0) {
+            let line;
+            if (partial.length === 0) {
+                // Common case: the whole line is inside this chunk; decode in place.
+                line = data.toString("utf8", start, idx).trim();
+            }
+            else {
+                partial.push(data.subarray(start, idx));
+                line = Buffer.concat(partial).toString("utf8").trim();
+                partial = [];
+            }
+            if (line.length > 0) {
+                pending = pending
+                    .then(() => handleLine(socket, line))
+                    .catch((err) => failLine(socket, line, err));
+            }
+            start = idx + 1;
+            idx = data.indexOf(0x0a, start);
+        }
+        if (start < data.length) {
+            partial.push(data.subarray(start));
+        }
+    });
+}
+// A second listener on a Unix socket for clients on the same machine, which
+// skips the loopback TCP stack. TCP stays the primary transport.
+function startUnixServer(port) {
+    const socketPath = unixSocketPath(port);
+    if (!socketPath || !server || unixServer) {
+        return;
+    }
+    // The TCP port is ours, so a file left at this path belongs to an editor
+    // that exited without closing its listener.
+    try {
+        fs_1.default.unlinkSync(socketPath);
+    }
+    catch {
+        // nothing to remove
+    }
+    unixServer = net_1.default.createServer(handleConnection);
+    unixServer.on("error", (err) => {
+        log("warn", `Unix socket server error: ${err.message}`);
+    });
+    unixServer.listen(socketPath, () => {
+        log("info", `Unix socket server listening on ${socketPath}`);
+    });
+}
 function startServer() {
     if (server) {
         return;
     }
     const port = getPort();
-    server = net_1.default.createServer((socket) => {
-        activeSockets.add(socket);
-        log("info", `Client connected (${activeSockets.size} active)`);
-        socket.on("close", () => {
-            activeSockets.delete(socket);
-            log("info", `Client disconnected (${activeSockets.size} active)`);
-        });
-        socket.on("error", (err) => {
-            activeSockets.delete(socket);
-            log("warn", `Socket error: ${err.message}`);
-        });
-        let buffer = "";
-        socket.on("data", async (data) => {
-            buffer += data.toString("utf8");
-            let idx = buffer.indexOf("\n");
-            while (idx >= 0) {
-                const line = buffer.slice(0, idx).trim();
-                buffer = buffer.slice(idx + 1);
-                if (line.length === 0) {
-                    idx = buffer.indexOf("\n");
-                    continue;
-                }
-                let req = null;
-                try {
-                    req = JSON.parse(line);
-                }
-                catch (err) {
-                    const errResp = {
-                        id: -1,
-                        error: { message: `Invalid JSON: ${(err === null || err === void 0 ? void 0 : err.message) || err}` },
-                    };
-                    socket.write(toLine(errResp));
-                    idx = buffer.indexOf("\n");
-                    continue;
-                }
-                const resp = await handleRequest(req);
-                socket.write(toLine(resp));
-                idx = buffer.indexOf("\n");
-            }
-        });
-    });
+    server = net_1.default.createServer(handleConnection);
     server.on("error", (err) => {
         log("error", `TCP server error: ${err.message}`);
         if (err.code === "EADDRINUSE") {
@@ -389,6 +519,7 @@ function startServer() {
     });
     server.listen(port, "127.0.0.1", () => {
         log("info", `TCP server listening on 127.0.0.1:${port}`);
+        startUnixServer(port);
     });
 }
 function stopServer() {
@@ -401,6 +532,10 @@ function stopServer() {
     activeSockets.clear();
     server.close();
     server = null;
+    if (unixServer) {
+        unixServer.close();
+        unixServer = null;
+    }
     log("info", "TCP server stopped");
 }
 module.exports = {
@@ -700,13 +700,8 @@ async function configureParticleSystem(params) {
 // ---------------------------------------------------------------------------
 // Prefab methods
 // ---------------------------------------------------------------------------
-async function getPrefabInfo(params) {
+function prefabInfoOf(node) {
     var _a, _b, _c;
-    const root = getSceneRoot();
-    const node = findNodeByUuid(root, params.uuid);
-    if (!node) {
-        throw new Error(`Node not found: ${params.uuid}`);
-    }
     const prefab = node._prefab;
     if (!prefab) {
         return { isPrefab: false };
@@ -718,6 +713,39 @@ async function getPrefabInfo(params) {
         rootUuid: ((_c = prefab.root) === null || _c === void 0 ? void 0 : _c.uuid) || null,
     };
 }
+async function getPrefabInfo(params) {
+    const root = getSceneRoot();
+    const node = findNodeByUuid(root, params.uuid);
+    if (!node) {
+        throw new Error(`Node not found: ${params.uuid}`);
+    }
+    return prefabInfoOf(node);
+}
+async function getPrefabInfoBulk(params) {
+    if (!Array.isArray(params === null || params === void 0 ? void 0 : params.uuids)) {
+        throw new Error("getPrefabInfoBulk requires { uuids: string[] }");
+    }
+    // One walk of the scene for all ids, stopping once every one is found,
+    // instead of a findNodeByUuid traversal per id.
+    const wanted = new Set(params.uuids);
+    const found = new Map();
+    const visit = (node) => {
+        if (wanted.has(node.uuid)) {
+            found.set(node.uuid, node);
+        }
+        for (const child of node.children) {
+            if (found.size === wanted.size) {
+                return;
+            }
+            visit(child);
+        }
+    };
+    visit(getSceneRoot());
+    return params.uuids.map((uuid) => {
+        const node = found.get(uuid);
+        return node ? prefabInfoOf(node) : { error: `Node not found: ${uuid}` };
+    });
+}
 function load() {
     installConsolePatch();
 }
@@ -756,6 +784,7 @@ module.exports = {
         configureParticleSystem,
         // Prefab
         getPrefabInfo,
+        getPrefabInfoBulk,
         // Logs
         getLogs,
     },
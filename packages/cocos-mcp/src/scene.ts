@@ -719,12 +719,7 @@ async function configureParticleSystem(params: { uuid: string; props: Record<str
 // Prefab methods
 // ---------------------------------------------------------------------------
 
-async function getPrefabInfo(params: { uuid: string }) {
-  const root = getSceneRoot();
-  const node = findNodeByUuid(root, params.uuid);
-  if (!node) {
-    throw new Error(`Node not found: ${params.uuid}`);
-  }
+function prefabInfoOf(node: Node) {
   const prefab = (node as any)._prefab;
   if (!prefab) {
     return { isPrefab: false };
@@ -737,6 +732,41 @@ async function getPrefabInfo(params: { uuid: string }) {
   };
 }
 
+async function getPrefabInfo(params: { uuid: string }) {
+  const root = getSceneRoot();
+  const node = findNodeByUuid(root, params.uuid);
+  if (!node) {
+    throw new Error(`Node not found: ${params.uuid}`);
+  }
+  return prefabInfoOf(node);
+}
+
+async function getPrefabInfoBulk(params: { uuids: string[] }) {
+  if (!Array.isArray(params?.uuids)) {
+    throw new Error("getPrefabInfoBulk requires { uuids: string[] }");
+  }
+  // One walk of the scene for all ids, stopping once every one is found,
+  // instead of a findNodeByUuid traversal per id.
+  const wanted = new Set(params.uuids);
+  const found = new Map<string, Node>();
+  const visit = (node: Node) => {
+    if (wanted.has(node.uuid)) {
+      found.set(node.uuid, node);
+    }
+    for (const child of node.children) {
+      if (found.size === wanted.size) {
+        return;
+      }
+      visit(child);
+    }
+  };
+  visit(getSceneRoot());
+  return params.uuids.map((uuid) => {
+    const node = found.get(uuid);
+    return node ? prefabInfoOf(node) : { error: `Node not found: ${uuid}` };
+  });
+}
+
 function load() {
   installConsolePatch();
 }
@@ -777,6 +807,7 @@ module.exports = {
     configureParticleSystem,
     // Prefab
     getPrefabInfo,
+    getPrefabInfoBulk,
     // Logs
     getLogs,
   },
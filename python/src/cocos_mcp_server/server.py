@@ -1,21 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
 import json
 import logging
+import os
+import random
 import socket
-import threading
+import stat
+import sys
+import tempfile
 import time
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from mcp.server.fastmcp import FastMCP
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib codec
+    orjson = None
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-)
 logger = logging.getLogger("cocos-mcp")
 
+# (level, option, value) triples passed to setsockopt() on every new
+# connection. Requests are small JSON lines answered synchronously, so
+# Nagle's algorithm only adds latency. Keepalive lets the OS notice a
+# vanished editor on an idle connection instead of the next request.
+DEFAULT_SOCKET_OPTIONS: Tuple[Tuple[int, int, int], ...] = (
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+) + tuple(
+    (socket.IPPROTO_TCP, getattr(socket, name), value)
+    for name, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+    if hasattr(socket, name)
+)
+
+# Longest response line accepted from the editor. asyncio's default of
+# 64 KiB is easily exceeded by scene.listNodes on a real project.
+READ_LIMIT = 64 * 1024 * 1024
+
+# Most calls request_batch() puts in one array line. Longer batches are
+# split into several lines on the same connection, so the editor never
+# has to parse, or hold the undo state for, an unbounded message.
+BATCH_CHUNK_SIZE = 25
+
+LOOPBACK_HOSTS = frozenset({"127.0.0.1", "localhost", "::1"})
+
+
+def _unix_socket_path(port: int) -> Optional[str]:
+    """Path of the Unix socket the editor extension opens next to ``port``.
+
+    The extension only listens on it where Unix sockets exist (not on
+    Windows); it must match ``unixSocketPath`` in packages/cocos-mcp.
+    The per-user runtime directory is preferred, so other local users
+    can't plant a socket at the path before the editor starts.
+    """
+    if sys.platform == "win32":
+        return None
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(base, f"cocos-mcp-{port}.sock")
+
+
+def _encode(obj: Any, sort_keys: bool = False) -> bytes:
+    """Serialize a wire message to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(
+        obj, ensure_ascii=False, sort_keys=sort_keys, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _encode_pretty(obj: Any) -> str:
+    """Serialize to 2-space indented JSON text (for files written by the editor)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def _decode(data: bytes) -> Any:
+    """Parse a wire message; both codecs accept raw bytes."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than JSON.stringify's output: it rejects
+            # escaped lone surrogates (broken UTF-16 in a node name or log
+            # line) and numbers like 1e400. The stdlib accepts both.
+            pass
+    return json.loads(data)
+
+
+class EditorError(RuntimeError):
+    """The editor answered a request with an error (bad uuid, unknown method, ...).
+
+    Unlike transport failures these are deterministic, so they are never
+    retried.
+    """
+
+
+# Cap on the retry backoff, in seconds, before jitter.
+MAX_RETRY_DELAY = 5.0
+
 
 class CocosSocketClient:
-    """TCP client that talks to the Cocos Creator editor extension."""
+    """TCP client that talks to the Cocos Creator editor extension.
+
+    Requests are multiplexed over a single connection: each one carries an
+    ``id`` and a background reader task hands responses back to the waiting
+    caller, so concurrent tool calls don't queue behind each other.
+    """
+
+    __slots__ = (
+        "host",
+        "port",
+        "max_retries",
+        "retry_delay",
+        "socket_options",
+        "request_timeout",
+        "unix_path",
+        "_writer",
+        "_reader_task",
+        "_pending",
+        "_overdue",
+        "_connect_lock",
+        "_write_lock",
+        "_ids",
+    )
 
     def __init__(
         self,
@@ -23,82 +136,466 @@ class CocosSocketClient:
         port: int,
         max_retries: int = 3,
         retry_delay: float = 1.0,
+        socket_options: Iterable[Tuple[int, int, int]] = DEFAULT_SOCKET_OPTIONS,
+        request_timeout: float = 10.0,
+        unix_path: Optional[str] = None,
     ) -> None:
         self.host = host
         self.port = port
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self._sock: Optional[socket.socket] = None
-        self._lock = threading.Lock()
-        self._next_id = 1
-
-    def _connect(self) -> None:
-        if self._sock:
-            return
+        self.socket_options = tuple(socket_options)
+        # Upper bound, in seconds, on one request() call end to end:
+        # connecting, waiting for the answer and any retries in between.
+        self.request_timeout = request_timeout
+        # Tried before TCP on every connect when set; an editor on the same
+        # machine answers on it without going through the loopback TCP stack.
+        self.unix_path = unix_path
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        # Ids whose caller timed out but that the editor hasn't answered
+        # yet, each with the timer that gives up on the connection.
+        self._overdue: Dict[int, asyncio.TimerHandle] = {}
+        self._connect_lock = asyncio.Lock()
+        # writelines() is atomic, so concurrent requests can't interleave
+        # bytes; the lock only exists because StreamWriter.drain() could not
+        # be awaited by several tasks at once before Python 3.11.
+        self._write_lock: Any = (
+            asyncio.Lock() if sys.version_info < (3, 11) else contextlib.nullcontext()
+        )
+        # next() on a count is atomic, so ids stay unique without a lock.
+        self._ids = itertools.count(1)
+
+    async def _connect(self, timeout: float) -> asyncio.StreamWriter:
+        writer = self._writer
+        if writer:
+            return writer
+        async with self._connect_lock:
+            if self._writer:
+                return self._writer
+            loop = asyncio.get_running_loop()
+            sock = None
+            if self.unix_path:
+                sock = await self._connect_unix(loop, timeout)
+            if sock is None:
+                sock = await self._connect_tcp(loop, timeout)
+            reader, writer = await asyncio.open_connection(sock=sock, limit=READ_LIMIT)
+            self._writer = writer
+            self._reader_task = loop.create_task(self._read_loop(reader))
+            if sock.family == socket.AF_INET:
+                logger.info("Connected to Cocos Creator at %s:%s", self.host, self.port)
+            else:
+                logger.info("Connected to Cocos Creator at %s", self.unix_path)
+            return writer
+
+    async def _connect_unix(
+        self, loop: asyncio.AbstractEventLoop, timeout: float
+    ) -> Optional[socket.socket]:
+        try:
+            st = os.stat(self.unix_path)
+        except OSError:
+            # No socket: older extension, or the editor runs elsewhere.
+            return None
+        if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+            # Not one our editor could have made (the path may sit in a
+            # shared /tmp); never send requests, or execute code, to it.
+            logger.warning("Ignoring %s: not a socket owned by this user", self.unix_path)
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.setblocking(False)
+            await asyncio.wait_for(loop.sock_connect(sock, self.unix_path), timeout)
+        except asyncio.TimeoutError:
+            sock.close()
+            raise
+        except OSError:
+            # Left behind by an editor that crashed, or otherwise unusable:
+            # the TCP port is still authoritative.
+            sock.close()
+            return None
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    async def _connect_tcp(
+        self, loop: asyncio.AbstractEventLoop, timeout: float
+    ) -> socket.socket:
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(10.0)
-        sock.connect((self.host, self.port))
-        self._sock = sock
-        logger.info("Connected to Cocos Creator at %s:%s", self.host, self.port)
-
-    def _disconnect(self) -> None:
-        if self._sock:
+        try:
+            for level, option, value in self.socket_options:
+                sock.setsockopt(level, option, value)
+            sock.setblocking(False)
+            await asyncio.wait_for(
+                loop.sock_connect(sock, (self.host, self.port)), timeout
+            )
+        except BaseException:
+            sock.close()
+            raise
+        if hasattr(socket, "TCP_QUICKACK"):
+            # Linux only: don't hold back the ACK for the request line.
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        return sock
+
+    def _disconnect(self, exc: Optional[BaseException] = None) -> None:
+        if self._reader_task:
+            if self._reader_task is not asyncio.current_task():
+                self._reader_task.cancel()
+            self._reader_task = None
+        if self._writer:
             try:
-                self._sock.close()
+                self._writer.close()
             except Exception:
                 pass
-            self._sock = None
-
-    def _send(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        self._connect()
-        assert self._sock is not None
-        data = (json.dumps(payload) + "\n").encode("utf-8")
-        self._sock.sendall(data)
-        buf = b""
-        while b"\n" not in buf:
-            chunk = self._sock.recv(4096)
-            if not chunk:
-                raise RuntimeError("Socket closed by Cocos Editor")
-            buf += chunk
-        line, _rest = buf.split(b"\n", 1)
-        return json.loads(line.decode("utf-8"))
-
-    def request(self, method: str, params: Any = None) -> Any:
-        with self._lock:
-            req_id = self._next_id
-            self._next_id += 1
-            payload = {"id": req_id, "method": method, "params": params}
-
-            last_err: Optional[Exception] = None
-            for attempt in range(self.max_retries):
-                try:
+            self._writer = None
+        overdue, self._overdue = self._overdue, {}
+        for timer in overdue.values():
+            timer.cancel()
+        pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_exception(exc or ConnectionError("Connection to Cocos Editor closed"))
+
+    def close(self) -> None:
+        """Drop the connection; the next request opens a new one."""
+        self._disconnect()
+
+    @property
+    def overdue(self) -> int:
+        """Requests that timed out here but are still queued in the editor."""
+        return len(self._overdue)
+
+    def _mark_overdue(self, ids: Sequence[int]) -> None:
+        """Keep timed-out ids registered until the editor answers them.
+
+        The editor runs a connection's requests strictly in order, so one
+        that never settles blocks everything sent after it. The ids stay in
+        ``_pending`` (their futures are cancelled, so a late answer is just
+        dropped) and count as load for CocosSocketPool. If they are still
+        unanswered one more ``request_timeout`` later, the connection is
+        dropped.
+        """
+        loop = asyncio.get_running_loop()
+        for req_id in ids:
+            if req_id in self._pending and req_id not in self._overdue:
+                self._overdue[req_id] = loop.call_later(
+                    self.request_timeout, self._drop_if_stuck, req_id
+                )
+
+    def _drop_if_stuck(self, req_id: int) -> None:
+        if self._overdue.pop(req_id, None) is None:
+            return
+        logger.warning(
+            "Cocos Creator still hasn't answered request id=%s; reconnecting", req_id
+        )
+        self._disconnect(ConnectionError("Cocos Editor stopped answering on this connection"))
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        """Route each response line to the request waiting on its id."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    raise ConnectionError("Socket closed by Cocos Editor")
+                decoded = _decode(line)
+                # A batch is answered with one array of responses.
+                for resp in decoded if isinstance(decoded, list) else (decoded,):
+                    req_id = resp.get("id")
+                    fut = self._pending.pop(req_id, None)
+                    if fut is not None and not fut.done():
+                        fut.set_result(resp)
+                    if self._overdue:
+                        timer = self._overdue.pop(req_id, None)
+                        if timer is not None:
+                            timer.cancel()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Lost connection to Cocos Creator: %s", e)
+            self._disconnect(ConnectionError(str(e)))
+
+    async def _send(
+        self, ids: Sequence[int], parts: List[bytes], deadline: float
+    ) -> List[asyncio.Future]:
+        """Write the encoded ``parts`` and return a future per response id."""
+        loop = asyncio.get_running_loop()
+        writer = await self._connect(deadline - loop.time())
+        futures = []
+        for req_id in ids:
+            fut = loop.create_future()
+            self._pending[req_id] = fut
+            futures.append(fut)
+        try:
+            async with self._write_lock:
+                # Hand the transport the body/newline fragments as-is; it
+                # gathers them with sendmsg() (Python 3.12+) or a single join.
+                writer.writelines(parts)
+                await writer.drain()
+        except BaseException:
+            for req_id in ids:
+                self._pending.pop(req_id, None)
+            raise
+        return futures
+
+    async def request(self, method: str, params: Any = None) -> Any:
+        req_id = next(self._ids)
+        # Encoded once; a retry resends the same bytes.
+        parts = [_encode({"id": req_id, "method": method, "params": params}), b"\n"]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.request_timeout
+        # Checked once per call so the common non-debug path skips the
+        # logger machinery entirely.
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        last_err: Optional[Exception] = None
+        attempts = 0
+        for attempt in range(self.max_retries):
+            attempts = attempt + 1
+            # Until the connection is up nothing has reached the editor, so
+            # any request can be retried; after that only read-only ones.
+            sent = False
+            try:
+                if debug:
                     logger.debug("-> %s (id=%s)", method, req_id)
-                    resp = self._send(payload)
-                    if resp.get("error"):
-                        raise RuntimeError(
-                            resp["error"].get("message", "Unknown error")
-                        )
-                    logger.debug("<- %s OK (id=%s)", method, req_id)
-                    return resp.get("result")
-                except (ConnectionError, OSError, RuntimeError) as e:
-                    last_err = e
-                    logger.warning(
-                        "Request %s failed (attempt %d/%d): %s",
-                        method,
-                        attempt + 1,
-                        self.max_retries,
-                        e,
-                    )
-                    self._disconnect()
-                    if attempt < self.max_retries - 1:
-                        time.sleep(self.retry_delay)
+                await self._connect(deadline - loop.time())
+                sent = True
+                (fut,) = await self._send((req_id,), parts, deadline)
+                try:
+                    resp = await asyncio.wait_for(fut, deadline - loop.time())
+                except asyncio.TimeoutError:
+                    self._mark_overdue((req_id,))
+                    raise
+                except BaseException:
+                    self._pending.pop(req_id, None)
+                    raise
+            except asyncio.TimeoutError:
+                # The whole deadline is used up. Other requests share this
+                # connection, so leave it open for now; _mark_overdue drops
+                # it if the editor never gets past this one.
+                last_err = TimeoutError(f"no response within {self.request_timeout:g}s")
+                logger.warning(
+                    "Request %s failed (attempt %d/%d): %s",
+                    method,
+                    attempts,
+                    self.max_retries,
+                    last_err,
+                )
+                break
+            except (ConnectionError, OSError) as e:
+                last_err = e
+                logger.warning(
+                    "Request %s failed (attempt %d/%d): %s",
+                    method,
+                    attempts,
+                    self.max_retries,
+                    e,
+                )
+                self._disconnect()
+                if sent and method not in NON_MUTATING_METHODS:
+                    # The editor may already be running it; sending it
+                    # again could apply the change twice.
+                    break
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                if attempt < self.max_retries - 1:
+                    backoff = min(self.retry_delay * 2 ** attempt, MAX_RETRY_DELAY)
+                    # Jitter keeps pooled connections from reconnecting in lockstep.
+                    backoff += random.random() * 0.1
+                    await asyncio.sleep(min(backoff, remaining))
+                continue
+
+            # Editor-reported errors are answers, not transport failures:
+            # surface them as-is and keep the connection.
+            if resp.get("error"):
+                raise EditorError(resp["error"].get("message", "Unknown error"))
+            if debug:
+                logger.debug("<- %s OK (id=%s)", method, req_id)
+            return resp.get("result")
+
+        raise RuntimeError(
+            f"Failed to communicate with Cocos Creator after {attempts} attempts. "
+            f"Make sure the editor is running with the cocos-mcp extension enabled. "
+            f"Last error: {last_err}"
+        )
 
+    async def request_batch(self, calls: Sequence[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+        """Send several requests as one message and collect their responses.
+
+        ``calls`` is a sequence of ``(method, params)`` pairs. They go out
+        as a single JSON array line, the editor runs them in order and
+        replies with one array; the returned list holds each call's
+        response envelope (``{"result": ...}`` or ``{"error": {...}}``) in
+        the same order. More than ``BATCH_CHUNK_SIZE`` calls are sent as
+        several array lines back to back; the editor still runs them in
+        order. Batches are not retried, since a dropped connection may
+        leave them partially applied.
+        """
+        if not calls:
+            return []
+        ids = [next(self._ids) for _ in calls]
+        messages = [
+            {"id": req_id, "method": method, "params": params}
+            for req_id, (method, params) in zip(ids, calls)
+        ]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("-> batch of %d (id=%s..%s)", len(calls), ids[0], ids[-1])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.request_timeout
+        parts: List[bytes] = []
+        for start in range(0, len(messages), BATCH_CHUNK_SIZE):
+            # One JSON array line per chunk; the editor answers each with
+            # one array line.
+            parts += (_encode(messages[start:start + BATCH_CHUNK_SIZE]), b"\n")
+        try:
+            futures = await self._send(ids, parts, deadline)
+            try:
+                return list(await asyncio.wait_for(asyncio.gather(*futures), deadline - loop.time()))
+            except asyncio.TimeoutError:
+                self._mark_overdue(ids)
+                raise
+            except BaseException:
+                for req_id in ids:
+                    self._pending.pop(req_id, None)
+                raise
+        except asyncio.TimeoutError as e:
+            # As in request(): the connection is shared, keep it.
             raise RuntimeError(
-                f"Failed to communicate with Cocos Creator after {self.max_retries} attempts. "
-                f"Make sure the editor is running with the cocos-mcp extension enabled. "
-                f"Last error: {last_err}"
+                f"Batch request to Cocos Creator failed: no response within "
+                f"{self.request_timeout:g}s"
+            ) from e
+        except (ConnectionError, OSError) as e:
+            self._disconnect()
+            raise RuntimeError(f"Batch request to Cocos Creator failed: {e}") from e
+
+
+class CocosSocketPool:
+    """A few CocosSocketClient connections to the same editor.
+
+    The editor answers requests on one connection strictly in order, so
+    a slow call (a big asset query, say) holds up everything queued behind
+    it. Each request goes to the connection with the fewest requests in
+    flight, counting ones that timed out but are still queued in the
+    editor; sequential callers therefore keep reusing the first one and
+    extra sockets are only opened under concurrency. An extra socket that
+    sits unused for ``max_idle_time`` seconds is closed again, so a burst
+    of parallel calls doesn't pin editor connections for the whole
+    session; the first one stays open.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        size: int = 4,
+        max_idle_time: float = 180.0,
+        **client_kwargs: Any,
+    ) -> None:
+        if size < 1:
+            raise ValueError("pool size must be at least 1")
+        self.host = host
+        self.port = port
+        self.max_idle_time = max_idle_time
+        self._clients = [CocosSocketClient(host, port, **client_kwargs) for _ in range(size)]
+        self._in_flight = [0] * size
+        self._idle_timers: List[Optional[asyncio.TimerHandle]] = [None] * size
+
+    def _acquire(self) -> int:
+        # Requests that timed out still hold up the editor's queue for that
+        # connection until they are answered, so they count as load too.
+        clients, in_flight = self._clients, self._in_flight
+        i = min(range(len(clients)), key=lambda j: in_flight[j] + clients[j].overdue)
+        self._in_flight[i] += 1
+        timer = self._idle_timers[i]
+        if timer is not None:
+            timer.cancel()
+            self._idle_timers[i] = None
+        return i
+
+    def _release(self, i: int) -> None:
+        self._in_flight[i] -= 1
+        if i and not self._in_flight[i] and self.max_idle_time > 0:
+            self._idle_timers[i] = asyncio.get_running_loop().call_later(
+                self.max_idle_time, self._close_idle, i
             )
 
+    def _close_idle(self, i: int) -> None:
+        self._idle_timers[i] = None
+        if not self._in_flight[i]:
+            logger.debug("Closing idle editor connection #%d", i)
+            self._clients[i].close()
+
+    async def request(self, method: str, params: Any = None) -> Any:
+        i = self._acquire()
+        try:
+            return await self._clients[i].request(method, params)
+        finally:
+            self._release(i)
+
+    async def request_batch(self, calls: Sequence[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+        # A batch stays on one connection so its calls keep their order.
+        i = self._acquire()
+        try:
+            return await self._clients[i].request_batch(calls)
+        finally:
+            self._release(i)
+
+
+_CACHE_MISS = object()
+
+
+class ResponseCache:
+    """Short-lived LRU cache for results of read-only editor queries.
+
+    Agents tend to re-read the same node tree or asset info several times
+    in a row; serving those from memory saves a socket round trip each.
+    Entries expire after ``ttl`` seconds (``0`` disables caching) and the
+    whole cache is dropped whenever a mutating request goes out.
+
+    ``epoch`` counts those invalidations. A reader records it before its
+    request and passes it to ``put``, so a query that was already in
+    flight when a mutation went out cannot store a pre-mutation answer.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 2.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.epoch = 0
+        self._entries: "OrderedDict[Tuple[str, bytes], Tuple[float, Any]]" = OrderedDict()
+
+    @staticmethod
+    def key(method: str, params: Any) -> Tuple[str, bytes]:
+        return method, _encode(params, sort_keys=True)
+
+    def get(self, key: Tuple[str, bytes]) -> Any:
+        """Return the cached value, or ``_CACHE_MISS`` if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _CACHE_MISS
+        expires, value = entry
+        if time.monotonic() >= expires:
+            del self._entries[key]
+            return _CACHE_MISS
+        self._entries.move_to_end(key)
+        return value
+
+    def put(
+        self, key: Tuple[str, bytes], value: Any, epoch: int, ttl: Optional[float] = None
+    ) -> None:
+        """Store ``value``; ``ttl`` can only shorten the cache-wide TTL."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if epoch != self.epoch or ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.epoch += 1
+        self._entries.clear()
+
 
 # ======================================================================
 # Action mapping tables
@@ -131,6 +628,7 @@ SCENE_ACTIONS: Dict[str, tuple] = {
     "add_physics_body":         ("scene.addPhysicsBody",         {"collider_type": "colliderType", "body_type": "bodyType", "collider_params": "colliderParams"}),
     "configure_particle_system": ("scene.configureParticleSystem", {}),
     "get_prefab_info":          ("scene.getPrefabInfo",          {}),
+    "get_prefab_info_bulk":     ("scene.getPrefabInfoBulk",      {}),
     "get_logs":                 ("scene.getLogs",                {}),
 }
 
@@ -155,41 +653,172 @@ EDITOR_ACTIONS: Dict[str, tuple] = {
     "redo":                ("editor.redo",               {}),
     "instantiate_prefab":  ("editor.instantiatePrefab",  {"asset_uuid": "assetUuid", "parent_uuid": "parentUuid"}),
     "create_prefab":       ("editor.createPrefab",       {"node_uuid": "nodeUuid"}),
+    "create_prefab_and_info": ("editor.createPrefabAndInfo", {"node_uuid": "nodeUuid"}),
     "get_logs":            ("editor.getLogs",             {}),
 }
 
+# Pure queries whose results may be served from ResponseCache.
+CACHEABLE_METHODS = frozenset(map(sys.intern, {
+    "scene.getActive",
+    "scene.listNodes",
+    "scene.getNodeProps",
+    "scene.getComponentProps",
+    "scene.getMaterialProperty",
+    "scene.getPrefabInfo",
+    "scene.getPrefabInfoBulk",
+    "assets.find",
+    "assets.getInfo",
+    "assets.getDependencies",
+    "scene.getLogs",
+    "editor.getLogs",
+}))
+
+# Per-method TTLs shorter than the cache default. Log buffers keep
+# growing, so only polls repeated within half a second share a result.
+CACHE_TTL_OVERRIDES: Dict[str, float] = {
+    "scene.getLogs": 0.5,
+    "editor.getLogs": 0.5,
+}
+
+# Requests that change nothing in the editor but are not worth caching
+# (their answers move on their own). Anything else invalidates the cache.
+NON_MUTATING_METHODS = CACHEABLE_METHODS | frozenset(map(sys.intern, {
+    "ping",
+    "editor.queryDirty",
+}))
+
 
 # ======================================================================
 # Dispatch helper
 # ======================================================================
 
-def _convert_params(params: Optional[dict], key_map: dict) -> Optional[dict]:
-    """Convert snake_case param keys to camelCase per the key_map."""
-    if not params:
-        return None
-    payload: Dict[str, Any] = {}
-    for k, v in params.items():
-        if v is None:
-            continue
-        payload[key_map.get(k, k)] = v
-    return payload or None
+Route = Callable[[Optional[dict]], Tuple[str, Optional[dict]]]
+
+
+def _make_route(tcp_method: str, key_map: dict) -> Route:
+    """Specialize one action-table entry into a ``params -> (method, payload)`` closure."""
+    # Interned so the CACHEABLE_METHODS / NON_MUTATING_METHODS lookups each
+    # request makes resolve on identity.
+    tcp_method = sys.intern(tcp_method)
+    rename = key_map.get
+
+    def route(params: Optional[dict]) -> Tuple[str, Optional[dict]]:
+        if not params:
+            return tcp_method, None
+        payload: Dict[str, Any] = {}
+        for k, v in params.items():
+            if v is not None:
+                payload[rename(k, k)] = v
+        return tcp_method, payload or None
+
+    if tcp_method != "assets.create":
+        return route
+
+    def create_route(params: Optional[dict]) -> Tuple[str, Optional[dict]]:
+        # assets.create takes file content as a string; serialize structured content.
+        if params and isinstance(params.get("content"), (dict, list)):
+            params = {**params, "content": _encode_pretty(params["content"])}
+        return route(params)
+
+    return create_route
+
+
+def _compile_routes(actions: Dict[str, tuple]) -> Dict[str, Route]:
+    return {action: _make_route(method, key_map) for action, (method, key_map) in actions.items()}
+
+
+SCENE_ROUTES = _compile_routes(SCENE_ACTIONS)
+ASSETS_ROUTES = _compile_routes(ASSETS_ACTIONS)
+EDITOR_ROUTES = _compile_routes(EDITOR_ACTIONS)
+
+
+async def _cached_request(
+    client: CocosSocketPool, cache: ResponseCache, method: str, params: Any = None
+) -> Any:
+    """Send a request, consulting or invalidating ``cache`` as appropriate."""
+    if method not in CACHEABLE_METHODS:
+        if method in NON_MUTATING_METHODS:
+            return await client.request(method, params)
+        cache.clear()
+        try:
+            return await client.request(method, params)
+        finally:
+            # A read sent on another connection while this write was in
+            # flight may have been answered before the write ran, and
+            # stored under the fresh epoch; drop it now the write is done.
+            cache.clear()
+    key = cache.key(method, params)
+    result = cache.get(key)
+    if result is _CACHE_MISS:
+        epoch = cache.epoch
+        result = await client.request(method, params)
+        cache.put(key, result, epoch, CACHE_TTL_OVERRIDES.get(method))
+    return result
+
+
+def _resolve(routes: Dict[str, Route], action: str, params: Optional[dict]) -> Tuple[str, Optional[dict]]:
+    """Map an action to its TCP method and camelCase params."""
+    route = routes.get(action)
+    if route is None:
+        available = ", ".join(sorted(routes))
+        raise ValueError(f"Unknown action: '{action}'. Available actions: {available}")
+    return route(params)
 
 
-def _dispatch(client: CocosSocketClient, actions: dict, action: str, params: Optional[dict]) -> Any:
+async def _dispatch(
+    client: CocosSocketPool,
+    cache: ResponseCache,
+    routes: Dict[str, Route],
+    action: str,
+    params: Optional[dict],
+) -> Any:
     """Route an action to the correct TCP method with param conversion."""
-    if action not in actions:
-        available = ", ".join(sorted(actions))
-        raise ValueError(f"Unknown action: '{action}'. Available actions: {available}")
-    tcp_method, key_map = actions[action]
+    tcp_method, converted = _resolve(routes, action, params)
+    return await _cached_request(client, cache, tcp_method, converted)
 
-    # Special handling: assets.create content serialization
-    if tcp_method == "assets.create" and params and "content" in params:
-        content = params["content"]
-        if isinstance(content, (dict, list)):
-            params = {**params, "content": json.dumps(content, ensure_ascii=False, indent=2)}
 
-    converted = _convert_params(params, key_map)
-    return client.request(tcp_method, converted)
+TOOL_ROUTES: Dict[str, Dict[str, Route]] = {
+    "scene": SCENE_ROUTES,
+    "assets": ASSETS_ROUTES,
+    "editor": EDITOR_ROUTES,
+}
+
+
+async def _dispatch_batch(
+    client: CocosSocketPool, cache: ResponseCache, calls: List[dict]
+) -> List[Dict[str, Any]]:
+    """Resolve ``{tool, action, params}`` entries and send them as one batch."""
+    resolved = []
+    for i, call in enumerate(calls):
+        if not isinstance(call, dict):
+            raise ValueError(
+                f"calls[{i}]: expected a dict {{tool, action, params?}}, got {type(call).__name__}"
+            )
+        tool = call.get("tool")
+        if tool not in TOOL_ROUTES:
+            available = ", ".join(sorted(TOOL_ROUTES))
+            raise ValueError(f"calls[{i}]: unknown tool '{tool}'. Available tools: {available}")
+        params = call.get("params")
+        if params is not None and not isinstance(params, dict):
+            raise ValueError(f"calls[{i}]: params must be a dict, got {type(params).__name__}")
+        resolved.append(_resolve(TOOL_ROUTES[tool], call.get("action", ""), params))
+
+    mutating = any(method not in NON_MUTATING_METHODS for method, _ in resolved)
+    if mutating:
+        cache.clear()
+    try:
+        responses = await client.request_batch(resolved)
+    finally:
+        if mutating:
+            # See _cached_request: reads that raced the batch are stale.
+            cache.clear()
+    results: List[Dict[str, Any]] = []
+    for resp in responses:
+        if resp.get("error"):
+            results.append({"error": resp["error"].get("message", "Unknown error")})
+        else:
+            results.append({"result": resp.get("result")})
+    return results
 
 
 # ======================================================================
@@ -263,6 +892,11 @@ Custom: pass the @ccclass name directly (e.g. 'PlayerController').
 
 ## Prefab info (get_prefab_info)
   Returns: isPrefab (bool), fileId (str|null), assetUuid (str|null), rootUuid (str|null)
+
+## Prefab info for many nodes (get_prefab_info_bulk)
+  uuids: list of node UUIDs, resolved in a single scene walk
+  Returns: one prefab info dict per uuid, in input order; unknown uuids
+  yield {error: "Node not found: <uuid>"} instead of failing the call
 """
 
 ASSETS_REFERENCE = """\
@@ -311,6 +945,13 @@ EDITOR_REFERENCE = """\
   node_uuid: UUID of the scene node to save as prefab
   path: target db:// path, e.g. 'db://assets/prefabs/MyPrefab.prefab'
 
+## create_prefab_and_info
+  Same params as create_prefab. Creates the prefab, then reads the node's
+  prefab info in the same editor round trip.
+  Returns: {created: <create_prefab result>, info: <get_prefab_info result>}
+  If only the info lookup fails, info is {error: "message"}; the prefab
+  was still created.
+
 ## get_logs
   level: optional filter ('log', 'info', 'warn', 'error')
   count: max entries (default 100, most recent first)
@@ -322,8 +963,20 @@ EDITOR_REFERENCE = """\
 # Server builder
 # ======================================================================
 
-def build_server(host: str, port: int) -> FastMCP:
-    client = CocosSocketClient(host, port)
+def build_server(
+    host: str, port: int, pool_size: int = 4, cache_ttl: float = 2.0
+) -> FastMCP:
+    # Imported here: FastMCP pulls in pydantic/anyio/starlette, which is
+    # most of the server's cold-start time.
+    from mcp.server.fastmcp import FastMCP
+
+    client = CocosSocketPool(
+        host,
+        port,
+        size=pool_size,
+        unix_path=_unix_socket_path(port) if host in LOOPBACK_HOSTS else None,
+    )
+    cache = ResponseCache(ttl=cache_ttl)
     mcp = FastMCP("CocosMCP")
 
     # ------------------------------------------------------------------
@@ -331,21 +984,21 @@ def build_server(host: str, port: int) -> FastMCP:
     # ------------------------------------------------------------------
 
     @mcp.tool()
-    def ping() -> str:
+    async def ping() -> str:
         """Check if the Cocos Creator editor is connected and responsive.
 
         Returns 'pong' if the editor extension is running and the TCP
         connection is alive. Use this to verify connectivity before
         performing other operations.
         """
-        return client.request("ping")
+        return await client.request("ping")
 
     # ------------------------------------------------------------------
     # Tool: execute
     # ------------------------------------------------------------------
 
     @mcp.tool()
-    def execute(scope: str, code: str, args: Optional[list] = None) -> Any:
+    async def execute(scope: str, code: str, args: Optional[list] = None) -> Any:
         """Execute arbitrary JavaScript code inside the Cocos Creator editor.
 
         This is a powerful escape hatch for operations not covered by
@@ -361,8 +1014,8 @@ def build_server(host: str, port: int) -> FastMCP:
             args: Optional list of arguments accessible as 'args' in the
                   executed code.
         """
-        return client.request(
-            "execute", {"scope": scope, "code": code, "args": args or []}
+        return await _cached_request(
+            client, cache, "execute", {"scope": scope, "code": code, "args": args or ()}
         )
 
     # ------------------------------------------------------------------
@@ -370,7 +1023,7 @@ def build_server(host: str, port: int) -> FastMCP:
     # ------------------------------------------------------------------
 
     @mcp.tool()
-    def scene(action: str, params: Optional[dict] = None) -> Any:
+    async def scene(action: str, params: Optional[dict] = None) -> Any:
         """Operate on the Cocos Creator scene. Read cocos://reference/scene for details.
 
         action                    | params
@@ -398,16 +1051,17 @@ def build_server(host: str, port: int) -> FastMCP:
         add_physics_body          | uuid, collider_type, body_type?, collider_params?
         configure_particle_system | uuid, props (dict)
         get_prefab_info           | uuid
+        get_prefab_info_bulk      | uuids (list)
         get_logs                  | level?, count?, pattern?
         """
-        return _dispatch(client, SCENE_ACTIONS, action, params)
+        return await _dispatch(client, cache, SCENE_ROUTES, action, params)
 
     # ------------------------------------------------------------------
     # Tool: assets
     # ------------------------------------------------------------------
 
     @mcp.tool()
-    def assets(action: str, params: Optional[dict] = None) -> Any:
+    async def assets(action: str, params: Optional[dict] = None) -> Any:
         """Manage Cocos Creator project assets. Read cocos://reference/assets for details.
 
         action           | params
@@ -423,28 +1077,45 @@ def build_server(host: str, port: int) -> FastMCP:
         reveal           | uuid
         request          | method, params?
         """
-        return _dispatch(client, ASSETS_ACTIONS, action, params)
+        return await _dispatch(client, cache, ASSETS_ROUTES, action, params)
 
     # ------------------------------------------------------------------
     # Tool: editor
     # ------------------------------------------------------------------
 
     @mcp.tool()
-    def editor(action: str, params: Optional[dict] = None) -> Any:
+    async def editor(action: str, params: Optional[dict] = None) -> Any:
         """Editor-level operations in Cocos Creator. Read cocos://reference/editor for details.
 
-        action              | params
-        --------------------|-------
-        save_scene          | (none)
-        query_dirty         | (none)
-        open_scene          | uuid
-        undo                | (none)
-        redo                | (none)
-        instantiate_prefab  | asset_uuid, parent_uuid?
-        create_prefab       | node_uuid, path
-        get_logs            | level?, count?, pattern?
+        action                 | params
+        -----------------------|-------
+        save_scene             | (none)
+        query_dirty            | (none)
+        open_scene             | uuid
+        undo                   | (none)
+        redo                   | (none)
+        instantiate_prefab     | asset_uuid, parent_uuid?
+        create_prefab          | node_uuid, path
+        create_prefab_and_info | node_uuid, path
+        get_logs               | level?, count?, pattern?
+        """
+        return await _dispatch(client, cache, EDITOR_ROUTES, action, params)
+
+    # ------------------------------------------------------------------
+    # Tool: batch
+    # ------------------------------------------------------------------
+
+    @mcp.tool()
+    async def batch(calls: list) -> list:
+        """Run several scene/assets/editor actions in a single round trip.
+
+        Each entry is a dict {"tool": "scene" | "assets" | "editor",
+        "action": str, "params": dict?} using the same actions and params
+        as the individual tools. Calls execute in order; the result is a
+        list with one {"result": ...} or {"error": "message"} per call.
+        A failing call does not stop the ones after it.
         """
-        return _dispatch(client, EDITOR_ACTIONS, action, params)
+        return await _dispatch_batch(client, cache, calls)
 
     # ------------------------------------------------------------------
     # Resources: detailed reference docs
@@ -468,19 +1139,46 @@ def build_server(host: str, port: int) -> FastMCP:
     return mcp
 
 
+def _configure_logging() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+
+
 def main() -> None:
     import argparse
 
     parser = argparse.ArgumentParser(description="Cocos Creator MCP server")
     parser.add_argument("--host", default="127.0.0.1")
     parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=4,
+        help="max editor connections used for concurrent tool calls",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=2.0,
+        help="seconds to reuse results of read-only queries (0 disables)",
+    )
     args = parser.parse_args()
+    _configure_logging()
 
     logger.info(
         "Starting Cocos MCP server (editor at %s:%s)", args.host, args.port
     )
-    server = build_server(args.host, args.port)
-    server.run()
+    server = build_server(args.host, args.port, args.pool_size, args.cache_ttl)
+    try:
+        import uvloop  # noqa: F401  (optional speedup)
+    except ImportError:
+        server.run()
+    else:
+        import anyio
+
+        anyio.run(server.run_stdio_async, backend_options={"use_uvloop": True})
 
 
 if __name__ == "__main__":
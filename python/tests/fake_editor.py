@@ -0,0 +1,115 @@
+"""In-process stand-in for the cocos-mcp editor extension."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+from typing import Any, Awaitable, Callable, List, Optional, Union
+
+Handler = Callable[[str, Any], Union[Any, Awaitable[Any]]]
+
+# Returned by a handler to drop the connection instead of answering.
+CLOSE = object()
+
+
+class FakeEditor:
+    """Line-oriented JSON-RPC server speaking the extension's protocol.
+
+    ``handler(method, params)`` returns the result, raises to answer with
+    an error, returns ``CLOSE`` to drop the connection, or is a coroutine
+    function that does any of those after awaiting. Like the extension,
+    each connection answers its requests strictly in order unless
+    ``ordered`` is false, in which case every request is handled in its
+    own task and answered as soon as it is done.
+
+    Use as ``async with FakeEditor(handler) as editor:``; ``editor.port``
+    is the TCP port, and ``unix_path`` opens a Unix socket instead.
+    """
+
+    def __init__(
+        self,
+        handler: Handler,
+        ordered: bool = True,
+        unix_path: Optional[str] = None,
+    ) -> None:
+        self.handler = handler
+        self.ordered = ordered
+        self.unix_path = unix_path
+        self.port = 0
+        self.connections = 0
+        # Every request seen, as (method, params), in arrival order.
+        self.received: List[tuple] = []
+        # Every decoded line, so batch framing can be checked.
+        self.lines: List[Any] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: List[asyncio.StreamWriter] = []
+
+    async def __aenter__(self) -> "FakeEditor":
+        if self.unix_path:
+            self._server = await asyncio.start_unix_server(self._serve, self.unix_path)
+        else:
+            self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+            self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        for writer in self._writers:
+            writer.close()
+        self._server.close()
+        await self._server.wait_closed()
+
+    def methods(self) -> List[str]:
+        return [method for method, _ in self.received]
+
+    async def _answer(self, req: dict) -> Any:
+        self.received.append((req["method"], req.get("params")))
+        try:
+            result = self.handler(req["method"], req.get("params"))
+            if inspect.isawaitable(result):
+                result = await result
+        except Exception as e:
+            return {"id": req["id"], "error": {"message": str(e)}}
+        if result is CLOSE:
+            return CLOSE
+        return {"id": req["id"], "result": result}
+
+    async def _handle_line(self, line: bytes, writer: asyncio.StreamWriter) -> bool:
+        msg = json.loads(line)
+        self.lines.append(msg)
+        if isinstance(msg, list):
+            resp: Any = []
+            for req in msg:
+                answer = await self._answer(req)
+                if answer is CLOSE:
+                    resp = CLOSE
+                    break
+                resp.append(answer)
+        else:
+            resp = await self._answer(msg)
+        if resp is CLOSE:
+            writer.close()
+            return False
+        writer.write(json.dumps(resp).encode() + b"\n")
+        await writer.drain()
+        return True
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.append(writer)
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if self.ordered:
+                    if not await self._handle_line(line, writer):
+                        return
+                else:
+                    task = asyncio.ensure_future(self._handle_line(line, writer))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
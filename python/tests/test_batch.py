@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from cocos_mcp_server.server import (
+    BATCH_CHUNK_SIZE,
+    CocosSocketClient,
+    CocosSocketPool,
+    ResponseCache,
+    _dispatch_batch,
+)
+from fake_editor import FakeEditor
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_long_batch_is_split_into_chunks_and_answered_in_order():
+    async def main():
+        async with FakeEditor(lambda method, params: params["n"]) as editor:
+            client = CocosSocketClient("127.0.0.1", editor.port)
+            responses = await client.request_batch(
+                [("scene.getNodeProps", {"n": n}) for n in range(60)]
+            )
+            client.close()
+            return responses, editor.lines
+
+    responses, lines = run(main())
+    assert BATCH_CHUNK_SIZE == 25
+    assert [len(line) for line in lines] == [25, 25, 10]
+    assert [resp["result"] for resp in responses] == list(range(60))
+
+
+def test_empty_batch_sends_nothing():
+    async def main():
+        async with FakeEditor(lambda method, params: None) as editor:
+            client = CocosSocketClient("127.0.0.1", editor.port)
+            assert await client.request_batch([]) == []
+            return editor.connections
+
+    assert run(main()) == 0
+
+
+def test_dispatch_batch_reports_each_call():
+    def handler(method, params):
+        if method == "scene.deleteNode":
+            raise Exception("Node not found")
+        return params
+
+    async def main():
+        async with FakeEditor(handler) as editor:
+            pool = CocosSocketPool("127.0.0.1", editor.port, size=1)
+            results = await _dispatch_batch(pool, ResponseCache(), [
+                {"tool": "scene", "action": "create_node", "params": {"parent_uuid": "p"}},
+                {"tool": "scene", "action": "delete_node", "params": {"uuid": "x"}},
+                {"tool": "assets", "action": "find", "params": {"asset_type": "cc.Prefab"}},
+            ])
+            pool._clients[0].close()
+            return results, editor.methods()
+
+    results, methods = run(main())
+    assert results == [
+        {"result": {"parentUuid": "p"}},
+        {"error": "Node not found"},
+        {"result": {"type": "cc.Prefab"}},
+    ]
+    assert methods == ["scene.createNode", "scene.deleteNode", "assets.find"]
+
+
+@pytest.mark.parametrize(
+    "call, message",
+    [
+        ("scene.getActive", r"calls\[0\]: expected a dict"),
+        ({"tool": "nodes", "action": "get_active"}, r"calls\[0\]: unknown tool 'nodes'"),
+        ({"tool": "scene", "action": "get_active", "params": []}, r"calls\[0\]: params must be a dict"),
+        ({"tool": "scene", "action": "nope"}, "Unknown action: 'nope'"),
+    ],
+)
+def test_dispatch_batch_rejects_malformed_calls(call, message):
+    async def main():
+        # Nothing is listening; validation must fail before any I/O.
+        pool = CocosSocketPool("127.0.0.1", 1, size=1)
+        await _dispatch_batch(pool, ResponseCache(), [call])
+
+    with pytest.raises(ValueError, match=message):
+        run(main())
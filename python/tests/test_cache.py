@@ -0,0 +1,88 @@
+import asyncio
+
+from cocos_mcp_server.server import (
+    CocosSocketPool,
+    ResponseCache,
+    SCENE_ROUTES,
+    _CACHE_MISS,
+    _dispatch,
+    _dispatch_batch,
+)
+from fake_editor import FakeEditor
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_put_ignores_results_from_before_an_invalidation():
+    cache = ResponseCache()
+    key = cache.key("scene.listNodes", None)
+    epoch = cache.epoch
+    cache.clear()
+    cache.put(key, ["stale"], epoch)
+    assert cache.get(key) is _CACHE_MISS
+    cache.put(key, ["fresh"], cache.epoch)
+    assert cache.get(key) == ["fresh"]
+
+
+def test_reads_are_cached_until_a_write():
+    async def main():
+        async with FakeEditor(lambda method, params: method) as editor:
+            pool = CocosSocketPool("127.0.0.1", editor.port, size=1)
+            cache = ResponseCache(ttl=60)
+            await _dispatch(pool, cache, SCENE_ROUTES, "list_nodes", None)
+            await _dispatch(pool, cache, SCENE_ROUTES, "list_nodes", None)
+            await _dispatch(pool, cache, SCENE_ROUTES, "create_node", {"name": "A"})
+            await _dispatch(pool, cache, SCENE_ROUTES, "list_nodes", None)
+            pool._clients[0].close()
+            return editor.methods()
+
+    assert run(main()) == ["scene.listNodes", "scene.createNode", "scene.listNodes"]
+
+
+def test_read_answered_during_a_write_is_not_served_afterwards():
+    async def handler(method, params):
+        if method == "scene.createNode":
+            await asyncio.sleep(0.1)
+        return method
+
+    async def main():
+        async with FakeEditor(handler) as editor:
+            pool = CocosSocketPool("127.0.0.1", editor.port, size=2)
+            cache = ResponseCache(ttl=60)
+            write = asyncio.ensure_future(
+                _dispatch(pool, cache, SCENE_ROUTES, "create_node", {"name": "A"})
+            )
+            await asyncio.sleep(0.02)
+            # Goes out on the second connection and is answered (and
+            # cached) before the write finishes.
+            await _dispatch(pool, cache, SCENE_ROUTES, "list_nodes", None)
+            await write
+            await _dispatch(pool, cache, SCENE_ROUTES, "list_nodes", None)
+            for client in pool._clients:
+                client.close()
+            return editor.methods()
+
+    assert run(main()) == ["scene.createNode", "scene.listNodes", "scene.listNodes"]
+
+
+def test_mutating_batch_invalidates_the_cache():
+    async def main():
+        async with FakeEditor(lambda method, params: method) as editor:
+            pool = CocosSocketPool("127.0.0.1", editor.port, size=1)
+            cache = ResponseCache(ttl=60)
+            await _dispatch(pool, cache, SCENE_ROUTES, "list_nodes", None)
+            await _dispatch_batch(pool, cache, [{"tool": "scene", "action": "get_active"}])
+            await _dispatch(pool, cache, SCENE_ROUTES, "list_nodes", None)
+            await _dispatch_batch(pool, cache, [{"tool": "scene", "action": "delete_node"}])
+            await _dispatch(pool, cache, SCENE_ROUTES, "list_nodes", None)
+            pool._clients[0].close()
+            return editor.methods()
+
+    assert run(main()) == [
+        "scene.listNodes",
+        "scene.getActive",
+        "scene.deleteNode",
+        "scene.listNodes",
+    ]
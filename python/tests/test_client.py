@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+
+from cocos_mcp_server.server import CocosSocketClient, CocosSocketPool, EditorError
+from fake_editor import CLOSE, FakeEditor
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_responses_are_matched_by_id():
+    async def handler(method, params):
+        # The first request is answered last.
+        await asyncio.sleep(0.05 * (3 - params["n"]))
+        return params["n"]
+
+    async def main():
+        async with FakeEditor(handler, ordered=False) as editor:
+            client = CocosSocketClient("127.0.0.1", editor.port)
+            results = await asyncio.gather(
+                *(client.request("scene.getNodeProps", {"n": n}) for n in range(3))
+            )
+            client.close()
+            return results, editor.connections
+
+    results, connections = run(main())
+    assert results == [0, 1, 2]
+    assert connections == 1
+
+
+def test_editor_error_is_raised_and_not_retried():
+    def handler(method, params):
+        raise Exception("Node not found")
+
+    async def main():
+        async with FakeEditor(handler) as editor:
+            client = CocosSocketClient("127.0.0.1", editor.port)
+            with pytest.raises(EditorError, match="Node not found"):
+                await client.request("scene.getNodeProps", {"uuid": "x"})
+            assert client._writer is not None
+            client.close()
+            return editor.methods()
+
+    assert run(main()) == ["scene.getNodeProps"]
+
+
+def test_timeout_keeps_the_connection_until_the_late_answer():
+    release = None
+
+    async def handler(method, params):
+        if method == "assets.find":
+            await release.wait()
+        return method
+
+    async def main():
+        nonlocal release
+        release = asyncio.Event()
+        async with FakeEditor(handler, ordered=False) as editor:
+            client = CocosSocketClient("127.0.0.1", editor.port, request_timeout=0.2)
+            with pytest.raises(RuntimeError, match="no response within"):
+                await client.request("assets.find", {})
+            writer = client._writer
+            assert writer is not None
+            assert client.overdue == 1
+            # Other requests still go out on the same connection.
+            assert await client.request("ping") == "ping"
+            release.set()
+            await asyncio.sleep(0.05)
+            assert client.overdue == 0
+            assert client._writer is writer
+            client.close()
+            return editor.connections
+
+    assert run(main()) == 1
+
+
+def test_connection_is_dropped_if_still_stuck_after_another_deadline():
+    async def handler(method, params):
+        await asyncio.Event().wait()
+
+    async def main():
+        async with FakeEditor(handler) as editor:
+            client = CocosSocketClient("127.0.0.1", editor.port, request_timeout=0.1)
+            with pytest.raises(RuntimeError, match="no response within"):
+                await client.request("scene.getActive")
+            assert client._writer is not None
+            await asyncio.sleep(0.2)
+            assert client._writer is None
+            assert client.overdue == 0
+            assert not client._pending
+
+    run(main())
+
+
+def test_pool_routes_around_a_connection_with_overdue_requests():
+    async def handler(method, params):
+        if method == "assets.find":
+            await asyncio.Event().wait()
+        return method
+
+    async def main():
+        async with FakeEditor(handler) as editor:
+            pool = CocosSocketPool("127.0.0.1", editor.port, size=2, request_timeout=0.2)
+            with pytest.raises(RuntimeError):
+                await pool.request("assets.find", {})
+            # Connection 0 is blocked behind the hung call; 1 answers.
+            assert await pool.request("ping") == "ping"
+            assert pool._clients[1]._writer is not None
+            for client in pool._clients:
+                client.close()
+
+    run(main())
+
+
+def test_mutating_request_is_not_resent_after_a_dropped_connection():
+    def handler(method, params):
+        return CLOSE
+
+    async def main():
+        async with FakeEditor(handler) as editor:
+            client = CocosSocketClient("127.0.0.1", editor.port, retry_delay=0.01)
+            with pytest.raises(RuntimeError, match="after 1 attempts"):
+                await client.request("scene.createNode", {"name": "A"})
+            return editor.methods()
+
+    assert run(main()) == ["scene.createNode"]
+
+
+def test_read_only_request_is_retried_after_a_dropped_connection():
+    seen = []
+
+    def handler(method, params):
+        seen.append(method)
+        return CLOSE if len(seen) == 1 else "Main"
+
+    async def main():
+        async with FakeEditor(handler) as editor:
+            client = CocosSocketClient("127.0.0.1", editor.port, retry_delay=0.01)
+            result = await client.request("scene.getActive")
+            client.close()
+            return result, editor.connections
+
+    assert run(main()) == ("Main", 2)
+    assert seen == ["scene.getActive", "scene.getActive"]
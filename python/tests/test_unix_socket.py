@@ -0,0 +1,104 @@
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+
+import pytest
+
+from cocos_mcp_server.server import CocosSocketClient, _unix_socket_path
+from fake_editor import FakeEditor
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="no Unix sockets")
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def sock_path():
+    # tmp_path can exceed the ~104 byte limit on socket paths.
+    with tempfile.TemporaryDirectory() as d:
+        yield os.path.join(d, "cocos-mcp-8787.sock")
+
+
+def test_socket_path_prefers_the_runtime_dir(monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+    assert _unix_socket_path(8787) == "/run/user/1000/cocos-mcp-8787.sock"
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    assert _unix_socket_path(8787) == os.path.join(tempfile.gettempdir(), "cocos-mcp-8787.sock")
+
+
+def _editors(sock_path):
+    unix = FakeEditor(lambda method, params: "unix", unix_path=sock_path)
+    tcp = FakeEditor(lambda method, params: "tcp")
+    return unix, tcp
+
+
+def test_connects_over_an_owned_socket(sock_path):
+    async def main():
+        unix, tcp = _editors(sock_path)
+        async with unix, tcp:
+            client = CocosSocketClient("127.0.0.1", tcp.port, unix_path=sock_path)
+            result = await client.request("ping")
+            client.close()
+            return result
+
+    assert run(main()) == "unix"
+
+
+def test_ignores_a_socket_owned_by_another_user(sock_path, monkeypatch):
+    async def main():
+        unix, tcp = _editors(sock_path)
+        async with unix, tcp:
+            monkeypatch.setattr(os, "getuid", lambda: os.stat(sock_path).st_uid + 1)
+            client = CocosSocketClient("127.0.0.1", tcp.port, unix_path=sock_path)
+            result = await client.request("ping")
+            client.close()
+            return result, unix.connections
+
+    assert run(main()) == ("tcp", 0)
+
+
+def test_ignores_a_path_that_is_not_a_socket(sock_path):
+    with open(sock_path, "w"):
+        pass
+
+    async def main():
+        async with FakeEditor(lambda method, params: "tcp") as tcp:
+            client = CocosSocketClient("127.0.0.1", tcp.port, unix_path=sock_path)
+            result = await client.request("ping")
+            client.close()
+            return result
+
+    assert run(main()) == "tcp"
+
+
+def test_falls_back_to_tcp_when_the_socket_is_stale(sock_path):
+    # Bound but never listening: what a crashed editor leaves behind.
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(sock_path)
+
+    async def main():
+        async with FakeEditor(lambda method, params: "tcp") as tcp:
+            client = CocosSocketClient("127.0.0.1", tcp.port, unix_path=sock_path)
+            result = await client.request("ping")
+            client.close()
+            return result
+
+    try:
+        assert run(main()) == "tcp"
+    finally:
+        stale.close()
+
+
+def test_falls_back_to_tcp_when_the_socket_is_missing(sock_path):
+    async def main():
+        async with FakeEditor(lambda method, params: "tcp") as tcp:
+            client = CocosSocketClient("127.0.0.1", tcp.port, unix_path=sock_path)
+            result = await client.request("ping")
+            client.close()
+            return result
+
+    assert run(main()) == "tcp"